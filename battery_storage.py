@@ -1,5 +1,25 @@
-from typing import Dict
-from logging_config import log_exceptions, get_logger
+from numba import jit
+from typing import Dict, Tuple
+from logging_config import get_logger
+
+@jit('float64(float64)', nopython=True, cache=True)
+def _temperature_factor(temperature: float) -> float:
+    return 1 - 0.005 * abs(temperature - 25)
+
+@jit('UniTuple(float64, 2)(float64, float64, float64, float64, float64)', nopython=True, cache=True)
+def _charge_battery_optimized(charge: float, capacity: float, efficiency: float,
+                              energy: float, temperature: float) -> Tuple[float, float]:
+    temp_adjusted_capacity = capacity * _temperature_factor(temperature)
+    energy_to_store = energy * efficiency
+    actual_stored = min(energy_to_store, temp_adjusted_capacity - charge)
+    return charge + actual_stored, actual_stored / efficiency
+
+@jit('UniTuple(float64, 2)(float64, float64, float64, float64)', nopython=True, cache=True)
+def _discharge_battery_optimized(charge: float, efficiency: float,
+                                 energy_needed: float, temperature: float) -> Tuple[float, float]:
+    temp_adjusted_charge = charge * _temperature_factor(temperature)
+    energy_to_discharge = min(energy_needed / efficiency, temp_adjusted_charge)
+    return charge - energy_to_discharge, energy_to_discharge * efficiency
 
 class BatteryStorage:
     def __init__(self, capacity: float, initial_charge: float = None, efficiency: float = 0.9):
@@ -10,24 +30,21 @@ class BatteryStorage:
         self.logger = get_logger(self.__class__.__name__)
 
     def temperature_factor(self, temperature: float) -> float:
-        return 1 - 0.005 * abs(temperature - 25)
+        return _temperature_factor(temperature)
     
-    @log_exceptions
     def charge_battery(self, energy: float, temperature: float) -> float:
         self.previous_charge = self.charge
-        temp_adjusted_capacity = self.capacity * self.temperature_factor(temperature)
-        energy_to_store = energy * self.efficiency
-        actual_stored = min(energy_to_store, temp_adjusted_capacity - self.charge)
-        self.charge += actual_stored
-        return actual_stored / self.efficiency
+        self.charge, charged = _charge_battery_optimized(
+            self.charge, self.capacity, self.efficiency, energy, temperature
+        )
+        return charged
     
-    @log_exceptions
     def discharge_battery(self, energy_needed: float, temperature: float) -> float:
         self.previous_charge = self.charge
-        temp_adjusted_charge = self.charge * self.temperature_factor(temperature)
-        energy_to_discharge = min(energy_needed / self.efficiency, temp_adjusted_charge)
-        self.charge -= energy_to_discharge
-        return energy_to_discharge * self.efficiency
+        self.charge, discharged = _discharge_battery_optimized(
+            self.charge, self.efficiency, energy_needed, temperature
+        )
+        return discharged
 
     def get_daily_data(self) -> Dict[str, float]:
         return {
@@ -1,8 +1,10 @@
 from dataclasses import dataclass
+from typing import Optional
 
 @dataclass
 class WeatherConfig:
     location: str
+    seed: Optional[int] = None
 
 @dataclass
 class SolarParkConfig:
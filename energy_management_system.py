@@ -1,10 +1,103 @@
-from typing import List, Dict, Any
+import logging
+import numpy as np
+from numba import jit
+from typing import Dict, Tuple
 from logging_config import log_exceptions, get_logger
 from solar_park_simulator import SolarParkSimulator
-from energy_profile import EnergyProfile
-from battery_storage import BatteryStorage
+from energy_profile import EnergyProfile, _gpu_power_consumption_optimized
+from battery_storage import BatteryStorage, _charge_battery_optimized, _discharge_battery_optimized
 from helper import DateHelper
 
+@jit(nopython=True, cache=True)
+def _allocate_hour_optimized(production: float, irrigation_need: float, server_need: float, temperature: float,
+                             charge: float, previous_charge: float, capacity: float, efficiency: float,
+                             gpu_power: float, num_gpus: int, gpu_utilization_range: np.ndarray, irrigation_hours: int):
+    irrigation = 0.0
+    servers = 0.0
+    gpu = 0.0
+    battery_change = 0.0
+    energy_deficit = 0.0
+    remaining_energy = production
+
+    # Priority 1: Servers
+    if remaining_energy >= server_need:
+        servers = server_need
+        remaining_energy -= server_need
+    else:
+        servers = remaining_energy
+        remaining_energy = 0.0
+        energy_deficit = server_need - servers
+        if energy_deficit > 0:
+            previous_charge = charge
+            charge, battery_discharge = _discharge_battery_optimized(charge, efficiency, energy_deficit, temperature)
+            servers += battery_discharge
+            battery_change -= battery_discharge
+
+    # Priority 2: Irrigation (if any energy left and irrigation conditions met)
+    if remaining_energy > 0 and irrigation_hours < 8:
+        if irrigation_need > 0 and remaining_energy >= irrigation_need:
+            irrigation = irrigation_need
+            remaining_energy -= irrigation_need
+            irrigation_hours += 1
+
+    # Priority 3: GPU (if any left)
+    if remaining_energy > 0:
+        gpu = _gpu_power_consumption_optimized(remaining_energy, gpu_power, num_gpus, gpu_utilization_range)
+        remaining_energy -= gpu
+    else:
+        # Allocate acceptable discharge equal to hourly discharge rate for 18 hours autonomy
+        acceptable_discharge = (capacity - server_need * 24) / 12
+        if charge > acceptable_discharge + server_need:
+            # allocates GPUs to use all acceptable discharge
+            gpu = _gpu_power_consumption_optimized(acceptable_discharge, gpu_power, num_gpus, gpu_utilization_range)
+            previous_charge = charge
+            charge, battery_discharge = _discharge_battery_optimized(charge, efficiency, gpu, temperature)
+            battery_change -= battery_discharge
+
+    # Use remaining energy for Battery Charging
+    if remaining_energy > 0:
+        previous_charge = charge
+        charge, charged_energy = _charge_battery_optimized(charge, capacity, efficiency, remaining_energy, temperature)
+        battery_change = charged_energy
+
+    return (irrigation, servers, gpu, battery_change, irrigation + servers + gpu, energy_deficit,
+            charge, previous_charge, irrigation_hours)
+
+@jit(nopython=True, cache=True)
+def _allocate_year_optimized(production: np.ndarray, irrigation_need: np.ndarray, server_need: np.ndarray,
+                             hour: np.ndarray, temperature: np.ndarray, charge: float, previous_charge: float,
+                             capacity: float, efficiency: float, gpu_power: float, num_gpus: int, gpu_utilization_range: np.ndarray,
+                             irrigation_hours: int):
+    n = production.shape[0]
+    irrigation = np.empty(n, dtype=np.float32)
+    servers = np.empty(n, dtype=np.float32)
+    gpu = np.empty(n, dtype=np.float32)
+    battery_change = np.empty(n, dtype=np.float32)
+    total_consumption = np.empty(n, dtype=np.float32)
+    battery_charge = np.empty(n)  # state of charge is integrated in float64
+    energy_deficit = np.empty(n, dtype=np.float32)
+    for i in range(n):
+        if hour[i] == 0:
+            irrigation_hours = 0
+        (irrigation[i], servers[i], gpu[i], battery_change[i], total_consumption[i], energy_deficit[i],
+         charge, previous_charge, irrigation_hours) = _allocate_hour_optimized(
+            production[i], irrigation_need[i], server_need[i], temperature[i], charge, previous_charge,
+            capacity, efficiency, gpu_power, num_gpus, gpu_utilization_range, irrigation_hours
+        )
+        battery_charge[i] = charge
+    return (irrigation, servers, gpu, battery_change, total_consumption, battery_charge, energy_deficit,
+            charge, previous_charge, irrigation_hours)
+
+ALLOC_DTYPE = np.dtype([
+    ('irrigation', 'f4'),
+    ('servers', 'f4'),
+    ('gpu', 'f4'),
+    ('battery_change', 'f4'),
+    ('total_consumption', 'f4'),
+    ('energy_deficit', 'f4')
+])
+ALLOCATION_FIELDS = ALLOC_DTYPE.names
+
 class EnergyManagementSystem:
     def __init__(self, solar_park: SolarParkSimulator, energy_profile: EnergyProfile, battery: BatteryStorage):
         self.solar_park = solar_park
@@ -12,86 +105,82 @@ class EnergyManagementSystem:
         self.battery = battery
         self.logger = get_logger(self.__class__.__name__)
         self.irrigation_hours = 0
+        self._day_to_month = DateHelper.get_day_to_month(solar_park.weather_simulator.year)
         
-    @log_exceptions    
-    def allocate_energy(self, production: float, month: int, hour: int, weather: Dict[str, Any]) -> Dict[str, float]:
-        self.logger.debug(f"Allocating energy: production={production}, month={month}, hour={hour}")
-        if hour == 0:
-            self.irrigation_hours = 0
-        # Calculate energy needs
-        irrigation_need = self.energy_profile.irrigation_need(month, hour, weather)
-        server_need = self.energy_profile.server_power_consumption(hour)
-        
-        # Initialize allocation dictionary
+    def allocate_energy(self, production: float, month: int, hour: int,
+                        is_raining: bool, temperature: float) -> Dict[str, float]:
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            self.logger.debug("Allocating energy: production=%s, month=%s, hour=%s", production, month, hour)
+        irrigation, servers, gpu, battery_change, total_consumption, energy_deficit = self._allocate_hour(
+            production, month, hour, is_raining, temperature
+        )
         allocation = {
-            'irrigation': 0,
-            'servers': 0,
-            'gpu': 0,
-            'battery_change': 0,
-            'total_consumption': 0,
-            '_energy_deficit': 0
+            'irrigation': irrigation,
+            'servers': servers,
+            'gpu': gpu,
+            'battery_change': battery_change,
+            'total_consumption': total_consumption,
+            '_energy_deficit': energy_deficit
         }
 
-        remaining_energy = production
-
-        # Priority 1: Servers
-        if remaining_energy >= server_need:
-            allocation['servers'] = server_need
-            remaining_energy -= server_need
-        else:
-            allocation['servers'] = remaining_energy
-            remaining_energy = 0
-            allocation['_energy_deficit'] += server_need - allocation['servers']
-            if allocation['_energy_deficit'] > 0:
-                battery_discharge = self.battery.discharge_battery(allocation['_energy_deficit'], weather['temperature'])
-                allocation['servers'] += battery_discharge
-                allocation['battery_change'] -= battery_discharge
-            
-        # Priority 2: Irrigation (if any energy left and irrigation conditions met)
-        if remaining_energy > 0 and self.irrigation_hours < 8:
-            irrigation_need = self.energy_profile.irrigation_need(month, hour, weather)
-            if irrigation_need > 0:
-                if remaining_energy >= irrigation_need:
-                    allocation['irrigation'] = irrigation_need
-                    remaining_energy -= irrigation_need
-                    self.irrigation_hours += 1
-                else:
-                    allocation['irrigation'] = 0
+        if debug:
+            self.logger.debug("Energy allocation result: %s", allocation)
+        return allocation
 
-        # Priority 3: GPU (if any left)
-        if remaining_energy > 0:
-            allocation['gpu'] = self.energy_profile.gpu_power_consumption(remaining_energy)
-            remaining_energy -= allocation['gpu']
-        else:
-            # Allocate acceptable discharge equal to hourly discharge rate for 18 hours autonomy
-            acceptable_discharge = (self.battery.capacity - server_need * 24) / 12        
-            if self.battery.charge > acceptable_discharge + server_need:
-                # allocates GPUs to use all acceptable discharge
-                allocation['gpu'] = self.energy_profile.gpu_power_consumption(acceptable_discharge)
-                allocation['battery_change'] -= self.battery.discharge_battery(allocation['gpu'], weather['temperature'])
-                
-        # Use remaining energy for Battery Charging
-        if remaining_energy > 0:
-            charged_energy = self.battery.charge_battery(remaining_energy, weather['temperature'])
-            allocation['battery_change'] = charged_energy
-            remaining_energy -= charged_energy
+    def _allocate_hour(self, production: float, month: int, hour: int,
+                       is_raining: bool, temperature: float) -> Tuple[float, float, float, float, float, float]:
+        if hour == 0:
+            self.irrigation_hours = 0
+        energy_profile = self.energy_profile
+        battery = self.battery
+        # Calculate energy needs
+        irrigation_need = energy_profile.irrigation_need(month, hour, is_raining)
+        server_need = energy_profile.server_power_consumption(hour)
 
-        # Calculate total consumption
-        allocation['total_consumption'] = sum([allocation['irrigation'], allocation['servers'], allocation['gpu']])
+        (irrigation, servers, gpu, battery_change, total_consumption, energy_deficit,
+         battery.charge, battery.previous_charge, self.irrigation_hours) = _allocate_hour_optimized(
+            production, irrigation_need, server_need, temperature,
+            battery.charge, battery.previous_charge, battery.capacity, battery.efficiency,
+            energy_profile.gpu_power, energy_profile.num_gpus,
+            energy_profile.gpu_utilization_range, self.irrigation_hours
+        )
+        return irrigation, servers, gpu, battery_change, total_consumption, energy_deficit
 
-        self.logger.debug(f"Energy allocation result: {allocation}")
-        return allocation
+    @log_exceptions
+    def allocate_year(self, production: np.ndarray, month: np.ndarray, hour: np.ndarray,
+                      weather: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        self.logger.debug("Allocating energy for %s hours", production.shape[0])
+        demand = self.energy_profile.annual_consumption(month, hour, weather['is_raining'])
+        (irrigation, servers, gpu, battery_change, total_consumption, battery_charge, energy_deficit,
+         charge, previous_charge, irrigation_hours) = _allocate_year_optimized(
+            production, demand['irrigation'], demand['servers'], hour, weather['temperature'],
+            self.battery.charge, self.battery.previous_charge, self.battery.capacity, self.battery.efficiency,
+            self.energy_profile.gpu_power, self.energy_profile.num_gpus,
+            self.energy_profile.gpu_utilization_range, self.irrigation_hours
+        )
+        self.battery.charge = charge
+        self.battery.previous_charge = previous_charge
+        self.irrigation_hours = irrigation_hours
+        return {
+            'irrigation': irrigation,
+            'servers': servers,
+            'gpu': gpu,
+            'battery_change': battery_change,
+            'total_consumption': total_consumption,
+            'battery_charge': battery_charge,
+            '_energy_deficit': energy_deficit
+        }
 
-    def get_daily_allocation(self, day: int, weather_data: Dict[str, List[float]]) -> List[Dict[str, float]]:
-        month = self._get_month(day)
-        daily_allocation = []
-        for hour in range(24):
-            weather = {key: weather_data[key][hour] for key in weather_data}
-            production = self.solar_park.calculate_hourly_energy(weather)
-            allocation = self.allocate_energy(production, month, hour, weather)
-            daily_allocation.append(allocation)
+    @log_exceptions
+    def get_daily_allocation(self, day: int, weather_data: Dict[str, np.ndarray]) -> np.ndarray:
+        production = self.solar_park.get_daily_production(weather_data)
+        month = np.full(24, self._get_month(day))
+        allocation = self.allocate_year(production, month, np.arange(24), weather_data)
+        daily_allocation = np.empty(24, dtype=ALLOC_DTYPE)
+        for field in ALLOCATION_FIELDS:
+            daily_allocation[field] = allocation['_energy_deficit' if field == 'energy_deficit' else field]
         return daily_allocation
 
-    @staticmethod
-    def _get_month(day: int) -> int:
-        return DateHelper.get_month(day)
+    def _get_month(self, day: int) -> int:
+        return int(self._day_to_month[day])
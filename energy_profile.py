@@ -1,8 +1,14 @@
 import numpy as np
 from numba import jit
-from logging_config import log_exceptions, get_logger
+from logging_config import get_logger
 from config import EnergyProfileConfig
-from typing import List
+from typing import List, Dict
+
+@jit('float64(float64, float64, int64, float64[:])', nopython=True, cache=True)
+def _gpu_power_consumption_optimized(available_energy: float, gpu_power: float, num_gpus: int, gpu_utilization_range: List[float]):
+    max_gpu_power = gpu_power * num_gpus * 1.3 # added simplified cooling load
+    utilization = min(1, available_energy / max_gpu_power)
+    return max_gpu_power * utilization * np.random.uniform(gpu_utilization_range[0], gpu_utilization_range[1])
 
 class EnergyProfile:
     def __init__(self, config: EnergyProfileConfig):
@@ -11,48 +17,51 @@ class EnergyProfile:
         self.programmer_power = config.programmer_power
         self.dosing_pump_power = config.dosing_pump_power
         self.irrigation_months = np.array(config.irrigation_months)
+        self.irrigation_mask = np.uint16(sum(1 << int(m) for m in config.irrigation_months))
         self.staking_nodes = config.staking_nodes
         self.staking_power = config.staking_power
         self.cooling_efficiency = config.cooling_efficiency
         self.gpu_power = config.gpu_power
-        self.gpu_utilization_range = np.array(config.gpu_utilization_range)
+        self.gpu_utilization_range = np.asarray(config.gpu_utilization_range, dtype=np.float64)
         self.num_gpus = config.num_gpus
+        # Irrigation demand only depends on the month and whether it rains: table[month, is_raining]
+        self.irrigation_table = np.array([
+            [self._irrigation_need_optimized(month, is_raining, self.irrigation_mask, self.pumps_power,
+                                             self.dosing_pump_power, self.programmer_power)
+             for is_raining in (False, True)]
+            for month in range(12)
+        ])
+        self.server_hourly_consumption = np.array([
+            self._server_power_consumption_optimized(hour, self.staking_nodes, self.staking_power)
+            for hour in range(24)
+        ])
 
-    @log_exceptions
-    def irrigation_need(self, month: int, hour: int, weather: int):
-        return self._irrigation_need_optimized(
-            month, weather['is_raining'], self.irrigation_months,
-            self.pumps_power, self.dosing_pump_power, self.programmer_power
-        )
+    def irrigation_need(self, month: int, hour: int, is_raining: bool):
+        return self.irrigation_table[month, int(is_raining)]
 
     @staticmethod
-    @jit(nopython=True)
-    def _irrigation_need_optimized(month: int, is_raining: bool, irrigation_months: List[int], pumps_power: float, dosing_pump_power: float, programmer_power: float):
-        if month in irrigation_months and not is_raining:
+    @jit('float64(int64, boolean, uint16, float64, float64, float64)', nopython=True, cache=True)
+    def _irrigation_need_optimized(month: int, is_raining: bool, irrigation_mask: int, pumps_power: float, dosing_pump_power: float, programmer_power: float):
+        if (irrigation_mask >> month) & 1 and not is_raining:
             return pumps_power + dosing_pump_power + programmer_power
         return 0
 
-    @log_exceptions
+    def annual_consumption(self, month: np.ndarray, hour: np.ndarray, is_raining: np.ndarray) -> Dict[str, np.ndarray]:
+        return {
+            'irrigation': self.irrigation_table.astype(np.float32)[month, is_raining.astype(np.int8)],
+            'servers': self.server_hourly_consumption.astype(np.float32)[hour]
+        }
+
     def server_power_consumption(self, hour: int):
-        return self._server_power_consumption_optimized(
-            hour, self.staking_nodes, self.staking_power
-        )
+        return self.server_hourly_consumption[hour]
 
     @staticmethod
-    @jit(nopython=True)
+    @jit('float64(int64, int64, float64)', nopython=True, cache=True)
     # Staking servers should run 24/7 disregarding the demand but considering cooling efficiency
     def _server_power_consumption_optimized(hour: int, staking_nodes: int, staking_power: float) -> float:
         return staking_power * 1.3 # Simplified cooling load
 
-    @log_exceptions
     def gpu_power_consumption(self, available_energy: float):
-        return self._gpu_power_consumption_optimized(
+        return _gpu_power_consumption_optimized(
             available_energy, self.gpu_power, self.num_gpus, self.gpu_utilization_range
-        )
-
-    @staticmethod
-    @jit(nopython=True)
-    def _gpu_power_consumption_optimized(available_energy: float, gpu_power: float, num_gpus: int, gpu_utilization_range: List[float]):
-        max_gpu_power = gpu_power * num_gpus * 1.3 # added simplified cooling load
-        utilization = min(1, available_energy / max_gpu_power)
-        return max_gpu_power * utilization * np.random.uniform(gpu_utilization_range[0], gpu_utilization_range[1])
+        )
\ No newline at end of file
@@ -1,6 +1,6 @@
 import numpy as np
-from config import load_config
 from calendar import isleap
+from functools import lru_cache
 from typing import List
 
 class DateHelper:
@@ -15,10 +15,12 @@ class DateHelper:
         return days_in_month
     
     @staticmethod
-    def get_month(day: int) -> int:
-        config = load_config()
-        return np.searchsorted(np.cumsum(DateHelper.get_days_in_month(config.year)), day + 1)
-    
+    @lru_cache(maxsize=4)
+    def get_day_to_month(year: int) -> np.ndarray:
+        day_to_month = np.repeat(np.arange(12, dtype=np.int8), DateHelper.get_days_in_month(year))
+        day_to_month.flags.writeable = False
+        return day_to_month
+
     @staticmethod
     def get_hours(year: int) -> int:
         days_in_year = sum(DateHelper.get_days_in_month(year))
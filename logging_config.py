@@ -30,7 +30,7 @@ def setup_logging(log_dir='logs', level=None, file_level=None, console_level=Non
     ch.setLevel(console_level)
 
     # Create formatter and add it to the handlers
-    file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
     console_formatter = logging.Formatter('%(name)s - %(levelname)s - %(message)s')
     fh.setFormatter(file_formatter)
     ch.setFormatter(console_formatter)
@@ -45,12 +45,14 @@ def get_logger(name):
     return logging.getLogger(name)
     
 def log_exceptions(func):
+    logger = logging.getLogger(func.__module__)
+
     @wraps(func)
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
         except Exception as e:
-            logging.exception(f"Exception occurred in {func.__name__}: {str(e)}")
+            logger.exception("Exception occurred in %s: %s", func.__name__, e)
             raise
     return wrapper
 
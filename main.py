@@ -8,9 +8,8 @@ os.environ['NUMBA_DEBUG'] = '0'
 # Local imports
 from simulator import Simulator
 
-# Reporting and plotting functions
+# Reporting functions
 from reporting import generate_report_off_grid
-from visualization import generate_charts
 from config import load_config
 
 # Set up logging
@@ -31,8 +30,9 @@ def main():
         # Generate reports
         generate_report_off_grid(results_summary, simulator.solar_park, simulator.battery)
 #NEED FIX      generate_comprehensive_daily_report(day: int, weather_sim: WeatherSimulator, solar_park: SolarParkSimulator, energy_profile: EnergyProfile, battery: BatteryStorage, ems: EnergyManagementSystem)
-        # Generate charts
-        generate_charts()  
+        # Generate charts (matplotlib and seaborn are only imported once they are needed)
+        from visualization import generate_charts
+        generate_charts(results)
         
         logger.info("Simulation completed successfully")
     except Exception as e:
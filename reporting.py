@@ -1,91 +1,97 @@
+import io
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Optional, TextIO
 from solar_park_simulator import SolarParkSimulator
 from energy_profile import EnergyProfile
 from battery_storage import BatteryStorage
-from energy_management_system import EnergyManagementSystem
+from energy_management_system import EnergyManagementSystem, ALLOCATION_FIELDS
 from weather_simulator import WeatherSimulator
 
-def generate_report_off_grid(results: Dict[str, Any], solar_park: SolarParkSimulator, battery: BatteryStorage):
-    print(f"Off-Grid Solar Park Simulation Report for {solar_park.weather_simulator.location}")
-    print("=" * 70)
-    print(f"Total Capacity: {solar_park.total_capacity:.2f} kWp")
-    print(f"Inverter Capacity: {solar_park.inverter_capacity:.2f} kWn")
-    print(f"Battery Capacity: {battery.capacity:.2f} kWh")
-    print(f"Performance Ratio: {solar_park.performance_ratio:.2f}")
-    print(f"Specific Yield: {results['specific_yield']:.2f} kWh/kWp")
-    print(f"\nTotal Annual Energy Production: {results['total_annual_production']:.2f} kWh")
-    print(f"Total Annual Energy Consumption: {results['total_annual_consumption']:.2f} kWh")
-    print(f"Total Energy Deficit: {results['total_energy_deficit']:.2f} kWh")
+def generate_report_off_grid(results: Dict[str, Any], solar_park: SolarParkSimulator, battery: BatteryStorage,
+                             file: Optional[TextIO] = None):
+    lines = [f"Off-Grid Solar Park Simulation Report for {solar_park.weather_simulator.location}"]
+    lines.append("=" * 70)
+    lines.append(f"Total Capacity: {solar_park.total_capacity:.2f} kWp")
+    lines.append(f"Inverter Capacity: {solar_park.inverter_capacity:.2f} kWn")
+    lines.append(f"Battery Capacity: {battery.capacity:.2f} kWh")
+    lines.append(f"Performance Ratio: {solar_park.performance_ratio:.2f}")
+    lines.append(f"Specific Yield: {results['specific_yield']:.2f} kWh/kWp")
+    lines.append(f"\nTotal Annual Energy Production: {results['total_annual_production']:.2f} kWh")
+    lines.append(f"Total Annual Energy Consumption: {results['total_annual_consumption']:.2f} kWh")
+    lines.append(f"Total Energy Deficit: {results['total_energy_deficit']:.2f} kWh")
     
     utilization_ratio = results['total_annual_consumption'] / results['total_annual_production']
-    print(f"\nEnergy Utilization Ratio: {utilization_ratio:.2%}")
+    lines.append(f"\nEnergy Utilization Ratio: {utilization_ratio:.2%}")
     
     min_battery_level = np.min(results['battery_charge'])
-    print(f"Minimum Battery Level: {min_battery_level:.2f} kWh ({min_battery_level/battery.capacity:.2%} of capacity)")
+    lines.append(f"Minimum Battery Level: {min_battery_level:.2f} kWh ({min_battery_level/battery.capacity:.2%} of capacity)")
 
-    print("\nAnnual Revenue:")
-    print(f"  Staking: €{results['annual_revenue']['staking']:.2f}")
-    print(f"  GPU Rental: €{results['annual_revenue']['gpu_rental']:.2f}")
-    print(f"  Total: €{results['annual_revenue']['total']:.2f}")
-    print(f"  Profitability: {results['annual_revenue']['ROI']:.2f}%")
+    lines.append("\nAnnual Revenue:")
+    lines.append(f"  Staking: €{results['annual_revenue']['staking']:.2f}")
+    lines.append(f"  GPU Rental: €{results['annual_revenue']['gpu_rental']:.2f}")
+    lines.append(f"  Total: €{results['annual_revenue']['total']:.2f}")
+    lines.append(f"  Profitability: {results['annual_revenue']['ROI']:.2f}%")
 
-    print("\nROI Analysis (7-year period):")
-    print(f"  Total Revenue: €{results['roi_analysis']['total_revenue_7years']:.2f}")
-    print(f"  CapEx: €{results['roi_analysis']['capex']:.2f}")    
-    print(f"  Profit: ${results['roi_analysis']['profit_7years']:.2f}")
-    print(f"  ROI: {results['roi_analysis']['roi_7years']:.2f}%")
-    print(f"  Payback Period: {results['roi_analysis']['payback_period']:.2f} years")
+    lines.append("\nROI Analysis (7-year period):")
+    lines.append(f"  Total Revenue: €{results['roi_analysis']['total_revenue_7years']:.2f}")
+    lines.append(f"  CapEx: €{results['roi_analysis']['capex']:.2f}")    
+    lines.append(f"  Profit: ${results['roi_analysis']['profit_7years']:.2f}")
+    lines.append(f"  ROI: {results['roi_analysis']['roi_7years']:.2f}%")
+    lines.append(f"  Payback Period: {results['roi_analysis']['payback_period']:.2f} years")
+    print("\n".join(lines), file=file)
 
 def generate_comprehensive_daily_report(day: int, weather_sim: WeatherSimulator, solar_park: SolarParkSimulator, 
                                         energy_profile: EnergyProfile, battery: BatteryStorage, 
                                         ems: EnergyManagementSystem) -> str:
     weather_data = weather_sim.get_daily_data(day)
     energy_production = solar_park.get_daily_production(weather_data)
-    energy_consumption = energy_profile.get_daily_consumption(day, weather_data, energy_production)
     battery_data = battery.get_daily_data()
     energy_allocation = ems.get_daily_allocation(day, weather_data)
+    energy_consumption = {
+        'irrigation': energy_allocation['irrigation'],
+        'servers': energy_allocation['servers'],
+        'gpu': energy_allocation['gpu'],
+        'total': energy_allocation['total_consumption']
+    }
 
-    report = f"Daily Report for Day {day + 1}\n"
-    report += "=" * 40 + "\n\n"
+    lines = [f"Daily Report for Day {day + 1}", "=" * 40, ""]
 
-    report += "Weather Data:\n"
-    for key in weather_data:
-        report += f"  {key}: {weather_data[key]}\n"
-    report += "\n"
+    lines.append("Weather Data:")
+    lines.extend(f"  {key}: {weather_data[key]}" for key in weather_data)
+    lines.append("")
 
-    report += "Energy Production (kWh):\n"
-    report += f"  {energy_production}\n\n"
+    lines.append("Energy Production (kWh):")
+    lines.append(f"  {energy_production}")
+    lines.append("")
 
-    report += "Energy Consumption (kWh):\n"
-    for key in energy_consumption:
-        report += f"  {key}: {energy_consumption[key]}\n"
-    report += "\n"
+    lines.append("Energy Consumption (kWh):")
+    lines.extend(f"  {key}: {energy_consumption[key]}" for key in energy_consumption)
+    lines.append("")
 
-    report += "Battery Data:\n"
-    for key, value in battery_data.items():
-        report += f"  {key}: {value}\n"
-    report += "\n"
+    lines.append("Battery Data:")
+    lines.extend(f"  {key}: {value}" for key, value in battery_data.items())
+    lines.append("")
 
-    report += "Energy Allocation:\n"
+    lines.append("Energy Allocation:")
     for hour, allocation in enumerate(energy_allocation):
-        report += f"  Hour {hour}:\n"
-        for key, value in allocation.items():
-            report += f"    {key}: {value}\n"
-    report += "\n"
+        lines.append(f"  Hour {hour}:")
+        lines.extend(f"    {key}: {value}" for key, value in zip(ALLOCATION_FIELDS, allocation))
+    lines.append("")
 
     # Calculate energy available for 24/7 supply and surplus
-    total_production = sum(energy_production)
-    total_consumption = sum(energy_consumption['total'])
-    energy_surplus = [max(0, energy_production[i] - energy_consumption['total'][i]) for i in range(24)]
+    total_production = energy_production.sum()
+    total_consumption = energy_consumption['total'].sum()
+    energy_surplus = np.maximum(0, energy_production - energy_consumption['total'])
     
-    report += "Energy Analysis:\n"
-    report += f"  Total Production: {total_production:.2f} kWh\n"
-    report += f"  Total Consumption: {total_consumption:.2f} kWh\n"
-    report += f"  Energy Available for 24/7 Supply: {min(energy_production):.2f} kWh/hour\n"
-    report += f"  Total Energy Surplus: {sum(energy_surplus):.2f} kWh\n"
-    report += "  Hourly Energy Surplus:\n"
-    for hour, surplus in enumerate(energy_surplus):
-        report += f"    Hour {hour}: {surplus:.2f} kWh\n"
+    lines.append("Energy Analysis:")
+    lines.append(f"  Total Production: {total_production:.2f} kWh")
+    lines.append(f"  Total Consumption: {total_consumption:.2f} kWh")
+    lines.append(f"  Energy Available for 24/7 Supply: {energy_production.min():.2f} kWh/hour")
+    lines.append(f"  Total Energy Surplus: {energy_surplus.sum():.2f} kWh")
+    lines.append("  Hourly Energy Surplus:")
+    hourly_surplus = io.StringIO()
+    np.savetxt(hourly_surplus, np.column_stack([np.arange(24), energy_surplus]), fmt="    Hour %d: %.2f kWh")
+    lines.append(hourly_surplus.getvalue().rstrip("\n"))
+    lines.append("")
 
-    return report
\ No newline at end of file
+    return "\n".join(lines)
\ No newline at end of file
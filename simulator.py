@@ -3,15 +3,16 @@ from energy_profile import EnergyProfile
 from battery_storage import BatteryStorage
 from energy_management_system import EnergyManagementSystem
 from weather_simulator import WeatherSimulator
-from datetime import datetime, timedelta
+from datetime import datetime
+import numpy as np
 import pandas as pd
-import csv
 import os
+from multiprocessing import get_context
 from logging_config import setup_logging, log_exceptions, get_logger
 import logging
 from reporting import generate_report_off_grid
 from config import load_config, SimulationConfig
-from typing import Dict, Any, List, Any
+from typing import Dict, List, Optional
 from helper import DateHelper
 
 class Simulator:
@@ -19,7 +20,10 @@ class Simulator:
         self.logger = get_logger(self.__class__.__name__)
         self.logger.info("Initializing Simulator")
         self.config = config
-        self.weather_simulator = WeatherSimulator(config.weather.location, config.year)
+        self.weather_simulator = WeatherSimulator(
+            config.weather.location, config.year, config.weather.seed,
+            cache_dir=os.path.join('data', 'weather_cache')
+        )
         self.solar_park = SolarParkSimulator(
             weather_simulator=self.weather_simulator,
             total_capacity=config.solar_park.total_capacity,
@@ -33,6 +37,7 @@ class Simulator:
             efficiency=config.battery.efficiency
         )
         self.ems = EnergyManagementSystem(self.solar_park, self.energy_profile, self.battery)
+        self._day_to_month = DateHelper.get_day_to_month(config.year)
         self.data_file = os.path.join('data', 'simulation_data.csv')
         self.ensure_data_directory()
         
@@ -40,42 +45,17 @@ class Simulator:
         os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
 
     @log_exceptions
-    def run_annual_simulation(self) -> List[Dict[str, Any]]:
+    def run_annual_simulation(self, save: bool = True) -> Dict[str, np.ndarray]:
         self.logger.info("Starting annual simulation")
-        results = []
-        with open(self.data_file, 'w', newline='') as csvfile:
-            fieldnames = ['datetime', 'sun_intensity', 'temperature', 'humidity', 
-                          'is_raining', 'cloud_cover', 'wind_speed',
-                          'production', 'irrigation', 'servers', 'gpu', 'battery_change',
-                          'total_consumption', 'battery_charge', 'energy_deficit']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for day in range(DateHelper.get_days(self.config.year)):
-                daily_results = self._run_daily_simulation(day)
-                results.extend(daily_results)
-                for result in daily_results:
-                    writer.writerow(result)
-        
-        self.logger.info("Completed annual simulation")
-        return results
-
-    def _run_daily_simulation(self, day: int) -> List[Dict[str, Any]]:
-        daily_results = []
-        for hour in range(24):
-            result = self._run_hourly_simulation(day, hour)
-            daily_results.append(result)
-        return daily_results
-
-    def _run_hourly_simulation(self, day: int, hour: int) -> Dict[str, Any]:
-        month = self._get_month(day)
-        weather = self.solar_park.weather_simulator.simulate_hour(day + 1, hour)
-        production = self.solar_park.calculate_hourly_energy(weather)
-        allocation = self.ems.allocate_energy(production, month, hour, weather)
-        #energy_deficit = max(0, allocation['total_consumption'] - production - allocation['battery_change'])
-        
-        step_data = {
-            'datetime': datetime(self.config.year, 1, 1) + timedelta(days=day, hours=hour),
+        days = DateHelper.get_days(self.config.year)
+        month = np.repeat(self._day_to_month, 24)
+        hour = np.tile(np.arange(24), days)
+        weather = self.weather_simulator.simulate_year_arrays()
+        production = self.solar_park.calculate_hourly_energy_array(weather)
+        allocation = self.ems.allocate_year(production, month, hour, weather)
+
+        results = {
+            'datetime': pd.date_range(datetime(self.config.year, 1, 1), periods=days * 24, freq='h').values,
             'sun_intensity': weather['sun_intensity'],
             'temperature': weather['temperature'],
             'humidity': weather['humidity'],
@@ -88,58 +68,63 @@ class Simulator:
             'gpu': allocation['gpu'],
             'battery_change': allocation['battery_change'],
             'total_consumption': allocation['total_consumption'],
-            'battery_charge': self.battery.charge,
+            'battery_charge': allocation['battery_charge'],
             'energy_deficit': allocation['_energy_deficit']
         }
-        
-        self._validate_simulation_step(step_data)
-        return step_data
-
-    def _get_month(self, day: int):
-        return DateHelper.get_month(day)
-
-    def _validate_simulation_step(self, step_data: Dict[str, Any]):
-        if step_data['production'] < 0:
-            self.logger.warning(f"Negative energy production: {step_data['production']} at {step_data['datetime']}")
-        if step_data['total_consumption'] < 0:
-            self.logger.warning(f"Negative energy consumption: {step_data['total_consumption']} at {step_data['datetime']}")
-        if step_data['battery_charge'] < 0:
-            self.logger.warning(f"Negative battery charge: {step_data['battery_charge']} at {step_data['datetime']}")
-        if step_data['total_consumption'] == 0:
-            self.logger.info(f"Zero consumption at {step_data['datetime']}")
-        if step_data['production'] == 0 and step_data['sun_intensity'] > 0:
-            self.logger.info(f"Zero production with non-zero sun intensity at {step_data['datetime']}")
-
-    def generate_report(self, results: List[Dict[str, Any]]) -> str:
-        df_results = pd.DataFrame(results)
-        
-        total_production = df_results['production'].sum()
-        total_consumption = df_results['total_consumption'].sum()
-        average_battery_charge = df_results['battery_charge'].mean()
-        total_energy_deficit = df_results['energy_deficit'].sum()
+        self._validate_simulation(results)
+        if save:
+            pd.DataFrame(results).to_csv(self.data_file, index=False, float_format='%.4f')
+
+        self.logger.info("Completed annual simulation")
+        return results
+
+    def _validate_simulation(self, results: Dict[str, np.ndarray]):
+        checks = [
+            (logging.WARNING, "Negative energy production", 'production'),
+            (logging.WARNING, "Negative energy consumption", 'total_consumption'),
+            (logging.WARNING, "Negative battery charge", 'battery_charge'),
+        ]
+        for level, message, key in checks:
+            if not self.logger.isEnabledFor(level):
+                continue
+            for index in np.flatnonzero(results[key] < 0):
+                self.logger.log(level, "%s: %s at %s", message, results[key][index], results['datetime'][index])
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        for index in np.flatnonzero(results['total_consumption'] == 0):
+            self.logger.info("Zero consumption at %s", results['datetime'][index])
+        for index in np.flatnonzero((results['production'] == 0) & (results['sun_intensity'] > 0)):
+            self.logger.info("Zero production with non-zero sun intensity at %s", results['datetime'][index])
+
+    def generate_report(self, results: Dict[str, np.ndarray]) -> str:
+        total_production = results['production'].sum(dtype=np.float64)
+        total_consumption = results['total_consumption'].sum(dtype=np.float64)
+        average_battery_charge = results['battery_charge'].mean()
+        total_energy_deficit = results['energy_deficit'].sum(dtype=np.float64)
 
         # Calculate revenues
-        staking_revenue = df_results['servers'].sum() * self.config.staking_rental_price
-        gpu_revenue = df_results['gpu'].sum() * self.config.gpu_rental_price
+        config = self.config
+        capex = (config.capex + config.num_gpus * config.gpu_cost_per_unit)
+        staking_revenue = results['servers'].sum(dtype=np.float64) * config.staking_rental_price
+        gpu_revenue = results['gpu'].sum(dtype=np.float64) * config.gpu_rental_price
         total_revenue = staking_revenue + gpu_revenue
-        roi = (total_revenue / (self.config.capex + self.config.num_gpus * self.config.gpu_cost_per_unit)) * 100
+        roi = (total_revenue / capex) * 100
 
         # ROI Analysis
         total_revenue_7years = total_revenue * 7
-        capex = (self.config.capex + self.config.num_gpus * self.config.gpu_cost_per_unit)
         profit_7years = total_revenue_7years - capex
         roi_7years = (profit_7years / capex) * 100
         payback_period = capex / total_revenue
 
         results_summary = {
-            'hourly_production': df_results['production'].values,
+            'hourly_production': results['production'],
             'hourly_consumption': {
-                'total': df_results['total_consumption'].values,
-                'farm_irrigation': df_results['irrigation'].values,
-                'data_center': df_results['servers'].values + df_results['gpu'].values
+                'total': results['total_consumption'],
+                'farm_irrigation': results['irrigation'],
+                'data_center': results['servers'] + results['gpu']
             },
-            'battery_charge': df_results['battery_charge'].values,
-            'energy_deficit': df_results['energy_deficit'].values,
+            'battery_charge': results['battery_charge'],
+            'energy_deficit': results['energy_deficit'],
             'total_annual_production': total_production,
             'total_annual_consumption': total_consumption,
             'average_battery_charge': average_battery_charge,
@@ -162,6 +147,28 @@ class Simulator:
 
         return results_summary
 
+def _simulate_config(config: SimulationConfig) -> Dict[str, np.ndarray]:
+    return Simulator(config).run_annual_simulation(save=False)
+
+def _init_sweep_worker(log_dir: str, file_level: int, console_level: int):
+    setup_logging(log_dir=log_dir, file_level=file_level, console_level=console_level)
+    logging.getLogger('numba').setLevel(logging.WARNING)
+
+def run_parameter_sweep(configs: List[SimulationConfig], processes: Optional[int] = None) -> List[Dict[str, np.ndarray]]:
+    # Scenarios are independent, so each one runs in its own worker process. Workers are
+    # spawned rather than forked: forking after Numba's threading layer has started hangs on exit.
+    # Spawned workers start without handlers, so recreate the parent's file and console levels in each one
+    initializer, initargs = None, ()
+    handlers = logging.getLogger().handlers
+    file_handler = next((h for h in handlers if isinstance(h, logging.FileHandler)), None)
+    console_handler = next((h for h in handlers if type(h) is logging.StreamHandler), None)
+    if file_handler is not None:
+        initializer = _init_sweep_worker
+        initargs = (os.path.dirname(file_handler.baseFilename), file_handler.level,
+                    console_handler.level if console_handler is not None else logging.CRITICAL)
+    with get_context('spawn').Pool(processes, initializer=initializer, initargs=initargs) as pool:
+        return pool.map(_simulate_config, configs)
+
 def main():
     logger = setup_logging(file_level=logging.DEBUG, console_level=logging.WARNING)
     logger.debug("Logging initialized")
@@ -1,9 +1,49 @@
 import numpy as np
-from numba import jit
-from typing import List, Dict, Any
+from numba import jit, njit, prange
+from typing import Dict, Any
 from logging_config import log_exceptions, get_logger
 from weather_simulator import WeatherSimulator
 
+@jit(nopython=True, cache=True, fastmath=True)
+def _calculate_hourly_energy_optimized(total_capacity: float, inverter_capacity: float, performance_ratio: float,
+                                       panel_efficiency: float, temp_coefficient: float, dust_factor: float,
+                                       misc_losses: float, annual_degradation: float, years_in_operation: float,
+                                       sun_intensity: float, temperature: float, humidity: float,
+                                       cloud_cover: float, wind_speed: float, is_raining: bool) -> float:
+    degradation_factor = (1 - annual_degradation) ** years_in_operation
+    base_energy = total_capacity * sun_intensity * performance_ratio * degradation_factor
+
+    temp_adjustment = 1 + temp_coefficient * (temperature - 25)
+    humidity_adjustment = 1 - (humidity - 50) * 0.001
+    cloud_adjustment = 1 - 0.75 * cloud_cover
+    wind_cooling = 1 + 0.001 * wind_speed
+    rain_adjustment = 1.0 - 0.1 * is_raining
+
+    energy_produced = (base_energy * temp_adjustment * humidity_adjustment * 
+                       cloud_adjustment * wind_cooling * rain_adjustment * 
+                       dust_factor * misc_losses)
+
+    inverter_efficiency = min(0.9 + 0.05 * (energy_produced / inverter_capacity), 0.98)
+    return min(energy_produced * inverter_efficiency, inverter_capacity)
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def _production_loop(sun_intensity: np.ndarray, temperature: np.ndarray, humidity: np.ndarray,
+                     cloud_cover: np.ndarray, wind_speed: np.ndarray, is_raining: np.ndarray,
+                     total_capacity: float, inverter_capacity: float, performance_ratio: float,
+                     panel_efficiency: float, temp_coefficient: float, dust_factor: float,
+                     misc_losses: float, annual_degradation: float, years_in_operation: float) -> np.ndarray:
+    production = np.empty(sun_intensity.shape[0], dtype=np.float32)
+    for i in prange(sun_intensity.shape[0]):
+        production[i] = _calculate_hourly_energy_optimized(
+            total_capacity, inverter_capacity, performance_ratio,
+            panel_efficiency, temp_coefficient, dust_factor,
+            misc_losses, annual_degradation, years_in_operation,
+            sun_intensity[i], temperature[i], humidity[i],
+            cloud_cover[i], wind_speed[i], is_raining[i]
+        )
+    return production
+
 class SolarParkSimulator:
     def __init__(self, weather_simulator: WeatherSimulator, total_capacity: float, inverter_capacity: float, 
                  performance_ratio: float):
@@ -23,41 +63,34 @@ class SolarParkSimulator:
 
     @log_exceptions
     def calculate_hourly_energy(self, weather: Dict[str, float]):
-        return self._calculate_hourly_energy_optimized(
-            self.total_capacity, self.inverter_capacity, self.performance_ratio,
-            self.panel_efficiency, self.temp_coefficient, self.dust_factor,
-            self.misc_losses, self.annual_degradation, self.years_in_operation,
+        return self.calculate_hourly_energy_scalar(
             weather['sun_intensity'], weather['temperature'], weather['humidity'],
             weather['cloud_cover'], weather['wind_speed'], weather['is_raining']
         )
 
-    @staticmethod
-    @jit(nopython=True)
-    def _calculate_hourly_energy_optimized(total_capacity: float, inverter_capacity: float, performance_ratio: float,
-                                           panel_efficiency: float, temp_coefficient: float, dust_factor: float,
-                                           misc_losses: float, annual_degradation: float, years_in_operation: float,
-                                           sun_intensity: float, temperature: float, humidity: float,
-                                           cloud_cover: float, wind_speed: float, is_raining: bool) -> float:
-        degradation_factor = (1 - annual_degradation) ** years_in_operation
-        base_energy = total_capacity * sun_intensity * performance_ratio * degradation_factor
-
-        temp_adjustment = 1 + temp_coefficient * (temperature - 25)
-        humidity_adjustment = 1 - (humidity - 50) * 0.001
-        cloud_adjustment = 1 - 0.75 * cloud_cover
-        wind_cooling = 1 + 0.001 * wind_speed
-        rain_adjustment = 0.9 if is_raining else 1
+    def calculate_hourly_energy_scalar(self, sun_intensity: float, temperature: float, humidity: float,
+                                       cloud_cover: float, wind_speed: float, is_raining: bool) -> float:
+        return _calculate_hourly_energy_optimized(
+            self.total_capacity, self.inverter_capacity, self.performance_ratio,
+            self.panel_efficiency, self.temp_coefficient, self.dust_factor,
+            self.misc_losses, self.annual_degradation, self.years_in_operation,
+            sun_intensity, temperature, humidity,
+            cloud_cover, wind_speed, is_raining
+        )
 
-        energy_produced = (base_energy * temp_adjustment * humidity_adjustment * 
-                           cloud_adjustment * wind_cooling * rain_adjustment * 
-                           dust_factor * misc_losses)
+    def calculate_hourly_energy_array(self, weather: Dict[str, np.ndarray]) -> np.ndarray:
+        return _production_loop(
+            weather['sun_intensity'], weather['temperature'], weather['humidity'],
+            weather['cloud_cover'], weather['wind_speed'], weather['is_raining'],
+            self.total_capacity, self.inverter_capacity, self.performance_ratio,
+            self.panel_efficiency, self.temp_coefficient, self.dust_factor,
+            self.misc_losses, self.annual_degradation, self.years_in_operation
+        )
 
-        inverter_efficiency = min(0.9 + 0.05 * (energy_produced / inverter_capacity), 0.98)
-        return min(energy_produced * inverter_efficiency, inverter_capacity)
-        
     def simulate_annual_production(self) -> Dict[str, Any]:
         self.logger.info("Starting annual simulation")
-        weather_data = self.weather_simulator.simulate_year()
-        hourly_production = np.array([self.calculate_hourly_energy(hour) for hour in weather_data])
+        weather_data = self.weather_simulator.simulate_year_arrays()
+        hourly_production = self.calculate_hourly_energy_array(weather_data)
         total_annual_production = np.sum(hourly_production)
         specific_yield = total_annual_production / self.total_capacity
         self.logger.info("Complete annual simulation")
@@ -68,7 +101,5 @@ class SolarParkSimulator:
             'specific_yield': specific_yield
         }
 
-    def get_daily_production(self, weather_data: Dict[str, List[float]]) -> List[float]:
-        return [self.calculate_hourly_energy(
-            {key: weather_data[key][i] for key in weather_data}
-        ) for i in range(24)]
\ No newline at end of file
+    def get_daily_production(self, weather_data: Dict[str, np.ndarray]) -> np.ndarray:
+        return self.calculate_hourly_energy_array(weather_data)
\ No newline at end of file
@@ -0,0 +1,10 @@
+from dataclasses import replace
+
+from config import load_config
+from energy_profile import EnergyProfile
+
+
+def test_gpu_power_consumption_accepts_integer_utilization_range():
+    config = load_config().energy_profile
+    energy_profile = EnergyProfile(replace(config, gpu_utilization_range=(1, 1)))
+    assert energy_profile.gpu_power_consumption(10.0) == 10.0
@@ -0,0 +1,28 @@
+from dataclasses import replace
+
+import numpy as np
+
+from config import load_config
+from simulator import Simulator, run_parameter_sweep
+
+
+def test_run_parameter_sweep_matches_in_process_run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = load_config()
+    # GPU utilisation is drawn from Numba's unseeded RNG; pin it so battery charge is reproducible
+    config = replace(config, weather=replace(config.weather, seed=42),
+                     energy_profile=replace(config.energy_profile, gpu_utilization_range=(0.8, 0.8)))
+    configs = [replace(config, battery=replace(config.battery, capacity=capacity)) for capacity in (250, 1000)]
+
+    # Run the parallel production kernel in the parent first, then sweep in worker processes
+    expected = [Simulator(cfg).run_annual_simulation(save=False) for cfg in configs]
+    results = run_parameter_sweep(configs, processes=2)
+
+    assert len(results) == len(configs)
+    for result, exp in zip(results, expected):
+        np.testing.assert_array_equal(result['temperature'], exp['temperature'])
+        np.testing.assert_array_equal(result['production'], exp['production'])
+        np.testing.assert_array_equal(result['battery_charge'], exp['battery_charge'])
+    # Each worker must have simulated its own battery capacity
+    assert not np.array_equal(results[0]['battery_charge'], results[1]['battery_charge'])
+    assert not (tmp_path / 'data' / 'simulation_data.csv').exists()
@@ -0,0 +1,39 @@
+import numpy as np
+
+import weather_simulator
+from weather_simulator import WeatherSimulator
+
+
+def test_seeded_year_is_reloaded_from_cache(tmp_path):
+    first = WeatherSimulator('Beja, Portugal', 2023, seed=1, cache_dir=str(tmp_path)).simulate_year_arrays()
+    assert len(list(tmp_path.glob('*.npz'))) == 1
+
+    cached = WeatherSimulator('Beja, Portugal', 2023, seed=1, cache_dir=str(tmp_path)).simulate_year_arrays()
+    for key, values in first.items():
+        np.testing.assert_array_equal(cached[key], values)
+        assert cached[key].dtype == values.dtype
+
+
+def test_cached_year_is_read_only(tmp_path):
+    simulated = WeatherSimulator('Beja, Portugal', 2023, seed=1, cache_dir=str(tmp_path))
+    loaded = WeatherSimulator('Beja, Portugal', 2023, seed=1, cache_dir=str(tmp_path))
+    for simulator in (simulated, loaded):
+        assert not any(values.flags.writeable for values in simulator.simulate_year_arrays().values())
+        assert not simulator.get_daily_data(0)['temperature'].flags.writeable
+
+
+def test_cache_key_includes_model_version(tmp_path, monkeypatch):
+    simulator = WeatherSimulator('Beja, Portugal', 2023, seed=1, cache_dir=str(tmp_path))
+    cache_file = simulator._cache_file()
+    monkeypatch.setattr(weather_simulator, 'WEATHER_CACHE_VERSION', weather_simulator.WEATHER_CACHE_VERSION + 1)
+    assert simulator._cache_file() != cache_file
+
+
+def test_failed_cache_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(np, 'savez_compressed', fail)
+    weather = WeatherSimulator('Beja, Portugal', 2023, seed=1, cache_dir=str(tmp_path)).simulate_year_arrays()
+    assert len(weather['temperature']) == 8760
+    assert list(tmp_path.iterdir()) == []
@@ -3,7 +3,7 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from matplotlib.dates import DateFormatter
 import os
-from typing import Dict, Any, List, Union
+from typing import Dict, Any, List, Optional, Union
 import numpy as np
 from config import load_config
 
@@ -70,12 +70,13 @@ def plot_chart(df: pd.DataFrame, x: str, y: Union[str, List[str]], title: str, x
 # Remove unused functions
 # Removed plot_energy_data and plot_battery_profile as they're not used in generate_charts
 
-def generate_charts():
+def generate_charts(results: Optional[Dict[str, np.ndarray]] = None):
     config = load_config()
     year = config.year
     
     ensure_charts_directory()
-    df = load_data()
+    # Use the in-memory results when available instead of parsing the CSV back
+    df = pd.DataFrame(results).set_index('datetime') if results is not None else load_data()
     
     # Calculate available energy for the entire dataset
     df['available_energy'] = df['production'] + df['battery_charge']
@@ -88,15 +89,7 @@ def generate_charts():
     winter_week = df.loc[f'{year}-03-15':f'{year}-03-22'].copy()
     summer_day = df.loc[f'{year}-08-23'].copy()
     winter_day = df.loc[f'{year}-03-23'].copy()
-    
-    # Calculate available energy for each subset
-    for subset in [summer_week, winter_week, summer_day, winter_day]:
-        subset['available_energy'] = subset['production'] + subset['battery_charge']
-  
-    # Calculate profit for each subset
-    for subset in [summer_week, winter_week, summer_day, winter_day]:
-        subset['staking_profit'] = subset['servers'] * config.staking_rental_price
-        subset['gpu_profit'] = subset['gpu'] * config.gpu_rental_price
+    # Subsets are sliced after the derived columns are added, so they carry them already
     
     # 1. Energy production vs weather conditions
     weather_conditions = ['sun_intensity', 'temperature', 'humidity', 'cloud_cover', 'wind_speed']
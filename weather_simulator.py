@@ -1,15 +1,34 @@
+import hashlib
+import os
+import tempfile
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from logging_config import log_exceptions, get_logger
 from helper import DateHelper
 
+# Part of the weather cache key: bump whenever the weather model or the cached arrays change
+WEATHER_CACHE_VERSION = 1
+
 class WeatherSimulator:
-    def __init__(self, location: str, year: int):
+    def __init__(self, location: str, year: int, seed: Optional[int] = None, cache_dir: Optional[str] = None):
         self.logger = get_logger(self.__class__.__name__)
         self.location = location
         self.year = year
         self.monthly_data = self.get_monthly_data()
         self.days_in_month = DateHelper.get_days_in_month(year)
+        self._day_to_month = DateHelper.get_day_to_month(year)
+        self._cum_days = np.cumsum(self.days_in_month)
+        self._mid_month = (np.concatenate(([0], self._cum_days[:-1])) + self._cum_days) // 2
+        self._sun_factor = np.maximum(0, np.cos(np.radians((np.arange(24) - 12) * 15)))  # Solar hour angle
+        days = np.arange(1, DateHelper.get_days(year) + 1)
+        self._daily_values = {
+            key: np.interp(days, self._mid_month, self.monthly_data[key])
+            for key in ('sun_hours', 'temp', 'humidity', 'cloud_cover', 'wind_speed')
+        }
+        self.seed = seed
+        self.cache_dir = cache_dir
+        self._rng = np.random.default_rng(seed)
+        self._year_cache = None
 
     @staticmethod
     def get_monthly_data():
@@ -25,65 +44,108 @@ class WeatherSimulator:
     
 
 
+    def reseed(self, seed: Optional[int] = None):
+        self.seed = seed
+        self._rng = np.random.default_rng(seed)
+        self._year_cache = None
+
+    def _cache_file(self) -> Optional[str]:
+        # Only seeded years are reproducible, so unseeded runs always simulate afresh
+        if self.cache_dir is None or self.seed is None:
+            return None
+        key = hashlib.md5(f"{WEATHER_CACHE_VERSION}_{self.location}_{self.year}_{self.seed}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
     @log_exceptions
     def simulate_hour(self, day_of_year: int, hour: int) -> Dict[str, Any]:
-        month = next(m for m, days in enumerate(self._cumulative_days()) if day_of_year <= days) - 1
-        self.logger.info("Starting hour simulation")
-        # Interpolate daily values from monthly data
-        sun_hours = np.interp(day_of_year, self._mid_month_days(), self.monthly_data['sun_hours'])
-        base_temp = np.interp(day_of_year, self._mid_month_days(), self.monthly_data['temp'])
-        humidity = np.interp(day_of_year, self._mid_month_days(), self.monthly_data['humidity'])
-        precipitation_prob = self.monthly_data['precipitation_days'][month] / self.days_in_month[month]
-        cloud_cover = np.interp(day_of_year, self._mid_month_days(), self.monthly_data['cloud_cover'])
-        wind_speed = np.interp(day_of_year, self._mid_month_days(), self.monthly_data['wind_speed'])
+        index = (day_of_year - 1) * 24 + hour
+        return {key: values[index] for key, values in self.simulate_year_arrays().items()}
+
+    @log_exceptions
+    def simulate_year_arrays(self) -> Dict[str, np.ndarray]:
+        if self._year_cache is not None:
+            return self._year_cache
+        cache_file = self._cache_file()
+        if cache_file is not None and os.path.exists(cache_file):
+            self.logger.info("Loading simulated weather from %s", cache_file)
+            with np.load(cache_file) as cached:
+                self._year_cache = {key: cached[key] for key in cached.files}
+            self._freeze_year_cache()
+            return self._year_cache
+        self.logger.info("Start vectorized annual simulation")
+        days = DateHelper.get_days(self.year)
+        hours = days * 24
+        day_of_year = np.repeat(np.arange(1, days + 1), 24)
+        hour_of_day = np.tile(np.arange(24), days)
+        day_index = day_of_year - 1
+        month = self._day_to_month[day_index]
+
+        # Expand daily values interpolated from monthly data
+        sun_hours = self._daily_values['sun_hours'][day_index]
+        base_temp = self._daily_values['temp'][day_index]
+        humidity = self._daily_values['humidity'][day_index]
+        cloud_cover = self._daily_values['cloud_cover'][day_index]
+        wind_speed = self._daily_values['wind_speed'][day_index]
+        precipitation_prob = (np.asarray(self.monthly_data['precipitation_days']) / np.asarray(self.days_in_month))[month]
 
         # Simulate hourly variations
-        hour_angle = (hour - 12) * 15  # Solar hour angle
-        sun_intensity = max(0, np.cos(np.radians(hour_angle))) * (sun_hours / 12)  # Adjust for actual sun hours
-        
+        sun_intensity = self._sun_factor[hour_of_day] * (sun_hours / 12)  # Adjust for actual sun hours
+
         # More sophisticated temperature model
-        temp = base_temp + 5 * sun_intensity - 2 * cloud_cover + np.random.normal(0, 1)
-        
+        temp = base_temp + 5 * sun_intensity - 2 * cloud_cover + self._rng.standard_normal(hours, dtype=np.float32)
+
         # More sophisticated humidity model
-        humidity = humidity - 10 * sun_intensity + 20 * cloud_cover + np.random.normal(0, 5)
+        humidity = humidity - 10 * sun_intensity + 20 * cloud_cover + 5 * self._rng.standard_normal(hours, dtype=np.float32)
         humidity = np.clip(humidity, 0, 100)
-        
+
         # Simplified precipitation model
-        is_raining = np.random.random() < precipitation_prob
-        self.logger.info("Completed hour simulation")
-        return {
-            'sun_intensity': sun_intensity,
-            'temperature': temp,
-            'humidity': humidity,
+        is_raining = self._rng.random(hours) < precipitation_prob
+
+        self._year_cache = {
+            'sun_intensity': sun_intensity.astype(np.float32),
+            'temperature': temp.astype(np.float32),
+            'humidity': humidity.astype(np.float32),
             'is_raining': is_raining,
-            'cloud_cover': cloud_cover,
-            'wind_speed': wind_speed
+            'cloud_cover': cloud_cover.astype(np.float32),
+            'wind_speed': wind_speed.astype(np.float32)
         }
+        self._freeze_year_cache()
+        if cache_file is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write then rename, so concurrent runs never load a partially written file
+            tmp_name = None
+            try:
+                with tempfile.NamedTemporaryFile(dir=self.cache_dir, suffix='.npz', delete=False) as tmp:
+                    tmp_name = tmp.name
+                    np.savez_compressed(tmp, **self._year_cache)
+                os.replace(tmp_name, cache_file)
+            except Exception as e:
+                if tmp_name is not None and os.path.exists(tmp_name):
+                    os.unlink(tmp_name)
+                self.logger.warning("Could not cache simulated weather to %s: %s", cache_file, e)
+        self.logger.info("Completed vectorized annual simulation")
+        return self._year_cache
+
+    def _freeze_year_cache(self):
+        # The cached year is shared by every caller (and get_daily_data hands out views), so make it read-only
+        for values in self._year_cache.values():
+            values.flags.writeable = False
 
     def simulate_year(self) -> List[Dict[str, Any]]:
         self.logger.info("Start annual simulation")
-        hourly_weather = []
-        for day in range(DateHelper.get_days(self.year)):
-            for hour in range(24):
-                hour_weather = self.simulate_hour(day + 1, hour)
-                hourly_weather.append(hour_weather)
+        year_arrays = self.simulate_year_arrays()
+        hourly_weather = [
+            {key: values[index] for key, values in year_arrays.items()}
+            for index in range(DateHelper.get_hours(self.year))
+        ]
         self.logger.info("Completed annual simulation")
         return hourly_weather
 
-    def _cumulative_days(self) -> List[int]:
-        return [sum(self.days_in_month[:i+1]) for i in range(12)]
+    def _cumulative_days(self) -> np.ndarray:
+        return self._cum_days
 
-    def _mid_month_days(self) -> List[int]:
-        cum_days = [0] + self._cumulative_days()
-        return [(cum_days[i] + cum_days[i+1]) // 2 for i in range(12)]
+    def _mid_month_days(self) -> np.ndarray:
+        return self._mid_month
 
-    def get_daily_data(self, day: int) -> Dict[str, List[float]]:
-        daily_data = {
-            'sun_intensity': [], 'temperature': [], 'humidity': [],
-            'is_raining': [], 'cloud_cover': [], 'wind_speed': []
-        }
-        for hour in range(24):
-            weather = self.simulate_hour(day + 1, hour)
-            for key in daily_data:
-                daily_data[key].append(weather[key])
-        return daily_data
\ No newline at end of file
+    def get_daily_data(self, day: int) -> Dict[str, np.ndarray]:
+        return {key: values[day * 24:(day + 1) * 24] for key, values in self.simulate_year_arrays().items()}
\ No newline at end of file